@@ -1,16 +1,10 @@
+import importlib
+
+from mlflow.exceptions import MlflowException
 from mlflow.metrics.base import (
     EvaluationExample,
     MetricValue,
 )
-from mlflow.metrics.genai.genai_metric import (
-    make_genai_metric,
-)
-from mlflow.metrics.genai.metric_definitions import (
-    answer_correctness,
-    answer_relevance,
-    answer_similarity,
-    faithfulness,
-)
 from mlflow.metrics.metric_definitions import (
     _accuracy_eval_fn,
     _ari_eval_fn,
@@ -35,20 +29,32 @@ from mlflow.models import (
     EvaluationMetric,
     make_metric,
 )
+from mlflow.protos.databricks_pb2 import INVALID_PARAMETER_VALUE
 from mlflow.utils.annotations import experimental
 
 
 @experimental
-def latency() -> EvaluationMetric:
+def latency(batch_size: int = 1) -> EvaluationMetric:
     """
     This function will create a metric for calculating latency. Latency is determined by the time
     it takes to generate a prediction for a given input. Note that computing latency requires
     each row to be predicted sequentially, which will likely slow down the evaluation process.
+
+    :param batch_size: (Optional) The number of rows to predict at once when computing latency.
+        When greater than 1, rows are predicted in batches and each row is assigned the batch's
+        prediction time divided by the number of rows in the batch. This is an estimate of the
+        per-row latency that makes the evaluation faster. Defaults to 1.
     """
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise MlflowException(
+            f"batch_size must be a positive integer, got {batch_size!r}.",
+            error_code=INVALID_PARAMETER_VALUE,
+        )
     return make_metric(
         eval_fn=lambda x: MetricValue(),
         greater_is_better=False,
         name="latency",
+        batch_size=batch_size,
     )
 
 
@@ -372,6 +378,29 @@ def f1_score() -> EvaluationMetric:
     return make_metric(eval_fn=_f1_score_eval_fn, greater_is_better=True, name="f1_score")
 
 
+# The genai metrics are only needed for LLM-judged evaluations, so their modules are imported
+# on first access instead of with ``mlflow.metrics``.
+_LAZY_GENAI_ATTRIBUTES = {
+    "make_genai_metric": "mlflow.metrics.genai.genai_metric",
+    "answer_correctness": "mlflow.metrics.genai.metric_definitions",
+    "answer_relevance": "mlflow.metrics.genai.metric_definitions",
+    "answer_similarity": "mlflow.metrics.genai.metric_definitions",
+    "faithfulness": "mlflow.metrics.genai.metric_definitions",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_GENAI_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_GENAI_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_GENAI_ATTRIBUTES))
+
+
 __all__ = [
     "EvaluationExample",
     "EvaluationMetric",
@@ -1,13 +1,22 @@
+import hashlib
 import json
 import logging
 import re
+import string
+import threading
+import time
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from inspect import Parameter, Signature
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
 
 from mlflow.exceptions import MlflowException
 from mlflow.metrics.base import EvaluationExample, MetricValue
 from mlflow.metrics.genai import model_utils
+from mlflow.metrics.genai.prompt_template import PromptTemplate
 from mlflow.metrics.genai.utils import _get_default_model, _get_latest_metric_version
 from mlflow.models import EvaluationMetric, make_metric
 from mlflow.protos.databricks_pb2 import (
@@ -19,67 +28,178 @@ from mlflow.protos.databricks_pb2 import (
 )
 from mlflow.utils.annotations import experimental
 from mlflow.utils.class_utils import _get_class_from_string
+from mlflow.utils.request_utils import _TRANSIENT_FAILURE_RESPONSE_CODES
+
+try:
+    # orjson is an optional, faster drop-in replacement for parsing judge responses. Its
+    # JSONDecodeError subclasses json.JSONDecodeError, so error handling is the same.
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 if TYPE_CHECKING:
     import pandas as pd
 
 _logger = logging.getLogger(__name__)
 
+_SCORE_JUSTIFICATION_RE = re.compile(r"score: (\d+),?\s*justification: (.+)")
 
-def _format_args_string(grading_context_columns: Optional[List[str]], eval_values, indx) -> str:
-    args_dict = {}
-    for arg in grading_context_columns:
-        if arg in eval_values:
-            args_dict[arg] = eval_values[arg][indx]
+
+def _percentile_90(scores: np.ndarray):
+    """
+    Equivalent to ``np.percentile(scores, 90)`` (linear interpolation), but uses an O(n)
+    partial sort instead of sorting the whole array.
+    """
+    if not scores.size:
+        return None
+    rank = 0.9 * (scores.size - 1)
+    lower = int(np.floor(rank))
+    upper = int(np.ceil(rank))
+    partitioned = np.partition(scores, [lower, upper])
+    return partitioned[lower] + (partitioned[upper] - partitioned[lower]) * (rank - lower)
+
+
+_AGGREGATIONS = {
+    "min": np.min,
+    "max": np.max,
+    "mean": np.mean,
+    "median": np.median,
+    "variance": np.var,
+    "p90": _percentile_90,
+}
+
+
+def _compute_aggregate_results(scores: np.ndarray, aggregations: List[str]) -> Dict[str, Any]:
+    aggregate_results = {}
+    mean = None
+    for option in aggregations:
+        if option not in _AGGREGATIONS:
+            raise MlflowException(
+                message=f"Invalid aggregate option {option}.",
+                error_code=INVALID_PARAMETER_VALUE,
+            )
+        if option in ("mean", "variance"):
+            # Share a single mean computation between the mean and variance aggregations
+            if mean is None:
+                mean = np.mean(scores)
+            aggregate_results[option] = (
+                mean if option == "mean" else np.mean(np.square(scores - mean))
+            )
         else:
+            aggregate_results[option] = _AGGREGATIONS[option](scores)
+    return aggregate_results
+
+
+def _get_grading_context_values(
+    grading_context_columns: Optional[List[str]], eval_values
+) -> List[Tuple[str, Any]]:
+    for arg in grading_context_columns:
+        if arg not in eval_values:
             raise MlflowException(
                 f"{arg} does not exist in the eval function {list(eval_values.keys())}."
             )
+    return [(arg, eval_values[arg]) for arg in grading_context_columns]
 
-    return (
-        ""
-        if args_dict is None
-        else (
-            "Additional information used by the model:\n"
-            + "\n".join(
-                [f"key: {arg}\nvalue:\n{arg_value}" for arg, arg_value in args_dict.items()]
-            )
-        )
+
+def _format_args_string(grading_context_values: List[Tuple[str, Any]], indx) -> str:
+    if not grading_context_values:
+        return ""
+    return "Additional information used by the model:\n" + "\n".join(
+        f"key: {arg}\nvalue:\n{arg_values[indx]}" for arg, arg_values in grading_context_values
     )
 
 
+def _compile_prompt_template(prompt_template: PromptTemplate) -> Callable[..., str]:
+    """
+    Returns a function equivalent to ``prompt_template.format`` that parses the template once,
+    so that formatting a prompt per row only concatenates the literal text and field values.
+    Templates using conversions, format specs or non-keyword fields fall back to ``format``.
+    """
+    parsed = list(string.Formatter().parse(prompt_template.template_str))
+    if any(
+        conversion or format_spec or (field_name is not None and not field_name.isidentifier())
+        for _, field_name, format_spec, conversion in parsed
+    ):
+        return prompt_template.format
+
+    def format_prompt(**kwargs: Any) -> str:
+        chunks = []
+        for literal_text, field_name, _, _ in parsed:
+            chunks.append(literal_text)
+            if field_name is not None:
+                chunks.append(format(kwargs[field_name]))
+        return "".join(chunks)
+
+    return format_prompt
+
+
+def _get_judge_cache_key(eval_model: str, eval_parameters: Dict[str, Any], prompt: str) -> str:
+    key = "\0".join([eval_model, json.dumps(eval_parameters, sort_keys=True, default=str), prompt])
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _is_transient_judge_error(error: Exception) -> bool:
+    """
+    Returns whether a failed judge request is worth retrying. Configuration errors (e.g. a missing
+    API key or an unsupported model uri) fail the same way on every attempt, so they are not.
+    """
+    if isinstance(error, MlflowException):
+        # Error responses from OpenAI or the gateway are raised without a more specific code
+        return error.error_code == ErrorCode.Name(INTERNAL_ERROR)
+    if isinstance(error, requests.exceptions.HTTPError):
+        return (
+            error.response is not None
+            and error.response.status_code in _TRANSIENT_FAILURE_RESPONSE_CODES
+        )
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
 # Function to extract Score and Justification
 def _extract_score_and_justification(output):
+    text = None
     if (
         isinstance(output, dict)
         and "candidates" in output
         and isinstance(output["candidates"], list)
         and output["candidates"]
+        and isinstance(output["candidates"][0], dict)
     ):
-        text = output["candidates"][0]["text"]
+        text = output["candidates"][0].get("text")
 
-    if text:
-        # Attempt to parse JSON
+    if not text or not isinstance(text, str):
+        return None, f"Failed to extract score and justification. Raw output: {output}"
+
+    # Only attempt to parse JSON when the response looks like a JSON object, so that free-form
+    # responses go straight to the regex without paying for a failed parse
+    data = None
+    stripped_text = text.lstrip()
+    if stripped_text.startswith("{"):
         try:
-            data = json.loads(text)
-            score = int(data.get("score"))
-            justification = data.get("justification")
+            data = _json_loads(stripped_text)
         except json.JSONDecodeError:
-            # If parsing fails, use regex
-            match = re.search(r"score: (\d+),?\s*justification: (.+)", text)
-            if match:
-                score = int(match.group(1))
-                justification = match.group(2)
-            else:
-                score = None
-                justification = f"Failed to extract score and justification. Raw output: {output}"
+            pass
 
-        if not isinstance(score, (int, float)) or not isinstance(justification, str):
-            return None, f"Failed to extract score and justification. Raw output: {output}"
+    if data is not None:
+        try:
+            score = int(data.get("score"))
+            justification = data.get("justification")
+        except (TypeError, ValueError):
+            # Valid JSON, but without an integer-like score
+            score = None
+            justification = None
+    else:
+        match = _SCORE_JUSTIFICATION_RE.search(text)
+        if match:
+            score = int(match.group(1))
+            justification = match.group(2)
+        else:
+            score = None
+            justification = None
 
-        return score, justification
+    if not isinstance(score, (int, float)) or not isinstance(justification, str):
+        return None, f"Failed to extract score and justification. Raw output: {output}"
 
-    return None, None
+    return score, justification
 
 
 @experimental
@@ -88,14 +208,16 @@ def make_genai_metric(
     definition: str,
     grading_prompt: str,
     examples: Optional[List[EvaluationExample]] = None,
-    version: Optional[str] = _get_latest_metric_version(),
-    model: Optional[str] = _get_default_model(),
-    grading_context_columns: Optional[List[str]] = [],  # noqa: B006
+    version: Optional[str] = None,
+    model: Optional[str] = None,
+    grading_context_columns: Optional[List[str]] = None,
     parameters: Optional[Dict[str, Any]] = None,
-    aggregations: Optional[List[str]] = ["mean", "variance", "p90"],  # noqa: B006
+    aggregations: Optional[List[str]] = None,
     greater_is_better: bool = True,
     max_workers: int = 10,
     judge_request_timeout: int = 60,
+    max_retries: int = 3,
+    cache: bool = True,
 ) -> EvaluationMetric:
     """
     Create a genai metric used to evaluate LLM using LLM as a judge in MLflow.
@@ -105,6 +227,7 @@ def make_genai_metric(
     :param grading_prompt: Grading criteria of the metric.
     :param examples: (Optional) Examples of the metric.
     :param version: (Optional) Version of the metric. Currently supported versions are: v1.
+        Defaults to the latest version.
     :param model: (Optional) Model uri of the of an openai or gateway judge model in the format of
         "openai:/gpt-4" or "gateway:/my-route". Defaults to
         "openai:/gpt-4". Your use of a third party LLM service (e.g., OpenAI) for
@@ -117,12 +240,19 @@ def make_genai_metric(
         set the temperature to 0.0, max_tokens to 200, and top_p to 1.0. We recommend
         setting the temperature to 0.0 for the LLM used as a judge to ensure consistent results.
     :param aggregations: (Optional) The list of options to aggregate the scores. Currently supported
-        options are: min, max, mean, median, variance, p90.
+        options are: min, max, mean, median, variance, p90. Defaults to mean, variance and p90.
     :param greater_is_better: (Optional) Whether the metric is better when it is greater.
     :param max_workers: (Optional) The maximum number of workers to use for judge scoring.
-        Defaults to 10 workers.
+        Defaults to 10 workers. Up to 32 concurrent connections to the judge are kept alive and
+        reused across requests.
     :param judge_request_timeout: (Optional) The timeout in seconds for each judge scoring request.
         Defaults to 60 seconds.
+    :param max_retries: (Optional) The maximum number of times a judge scoring request that failed
+        with a transient error (e.g. a connection error, a timeout or a rate limit) is retried
+        with exponential backoff. Defaults to 3 retries.
+    :param cache: (Optional) Whether to cache judge responses for identical prompts, so that
+        repeated rows and repeated evaluations with the returned metric are only scored once.
+        Defaults to True.
 
     :return: A metric object.
 
@@ -187,6 +317,19 @@ def make_genai_metric(
             greater_is_better=True,
         )
     """
+    if version is None:
+        version = _get_latest_metric_version()
+    if model is None:
+        model = _get_default_model()
+    if grading_context_columns is None:
+        grading_context_columns = []
+    if aggregations is None:
+        aggregations = ["mean", "variance", "p90"]
+    if not isinstance(max_retries, int) or max_retries < 0:
+        raise MlflowException(
+            f"max_retries must be a non-negative integer, got {max_retries!r}.",
+            error_code=INVALID_PARAMETER_VALUE,
+        )
 
     class_name = f"mlflow.metrics.genai.prompts.{version}.EvaluationModel"
     try:
@@ -211,6 +354,11 @@ def make_genai_metric(
         model,
         *(parameters,) if parameters is not None else (),
     ).to_dict()
+    format_eval_prompt = _compile_prompt_template(evaluation_context["eval_prompt"])
+
+    # Judge responses keyed by a hash of the judge model, its parameters and the formatted prompt
+    judge_cache: Dict[str, Tuple[Optional[int], Optional[str]]] = {}
+    judge_cache_lock = threading.Lock()
 
     def eval_fn(
         predictions: "pd.Series",
@@ -224,8 +372,9 @@ def make_genai_metric(
 
         eval_values = dict(zip(grading_context_columns, args))
 
-        outputs = predictions.to_list()
-        inputs = inputs.to_list()
+        # Index into the underlying arrays rather than re-boxing every value into a list
+        outputs = predictions.to_numpy(copy=False)
+        inputs = inputs.to_numpy(copy=False)
         eval_model = evaluation_context["model"]
         eval_parameters = evaluation_context["parameters"]
 
@@ -240,104 +389,107 @@ def make_genai_metric(
             )
 
         def score_model_on_one_payload(
-            indx,
-            input,
-            output,
-            grading_context_columns,
-            eval_values,
-            evaluation_context,
+            prompt,
             eval_parameters,
             eval_model,
         ):
-            try:
-                arg_string = _format_args_string(grading_context_columns, eval_values, indx)
-            except Exception as e:
-                raise MlflowException(
-                    f"Values for grading_context_columns are malformed and cannot be "
-                    f"formatted into a prompt for metric '{name}'.\n"
-                    f"Required columns: {grading_context_columns}\n"
-                    f"Values: {eval_values}\n"
-                    f"Error: {e!r}\n"
-                    f"Please check the following: \n"
-                    "- predictions and targets (if required) are provided correctly\n"
-                    "- grading_context_columns are mapped correctly using the evaluator_config "
-                    "parameter\n"
-                    "- input and output data are formatted correctly."
-                )
             payload = {
-                "prompt": evaluation_context["eval_prompt"].format(
-                    input=input, output=output, grading_context_columns=arg_string
-                ),
+                "prompt": prompt,
                 **eval_parameters,
             }
+            if cache:
+                cache_key = _get_judge_cache_key(eval_model, eval_parameters, prompt)
+                with judge_cache_lock:
+                    if cache_key in judge_cache:
+                        return judge_cache[cache_key]
+            for attempt in range(max_retries + 1):
+                try:
+                    raw_result = model_utils.score_model_on_payload(
+                        eval_model, payload, judge_request_timeout
+                    )
+                    break
+                except Exception as e:
+                    if isinstance(e, MlflowException):
+                        if e.error_code in [
+                            ErrorCode.Name(BAD_REQUEST),
+                            ErrorCode.Name(UNAUTHENTICATED),
+                        ]:
+                            raise MlflowException(e)
+                    if attempt == max_retries or not _is_transient_judge_error(e):
+                        return None, f"Failed to score model on payload. Error: {e!s}"
+                    # Back off exponentially before retrying transient errors such as rate limits
+                    time.sleep(min(0.5 * 2**attempt, 10))
+
             try:
-                raw_result = model_utils.score_model_on_payload(
-                    eval_model, payload, judge_request_timeout
-                )
-                return _extract_score_and_justification(raw_result)
+                score, justification = _extract_score_and_justification(raw_result)
             except Exception as e:
-                if isinstance(e, MlflowException):
-                    if e.error_code in [
-                        ErrorCode.Name(BAD_REQUEST),
-                        ErrorCode.Name(UNAUTHENTICATED),
-                    ]:
-                        raise MlflowException(e)
                 return None, f"Failed to score model on payload. Error: {e!s}"
 
-        scores = [None] * len(inputs)
-        justifications = [None] * len(inputs)
+            # Only successfully parsed responses are cached so that failures can be retried
+            if cache and score is not None:
+                with judge_cache_lock:
+                    judge_cache[cache_key] = (score, justification)
+            return score, justification
+
+        try:
+            grading_context_values = _get_grading_context_values(
+                grading_context_columns, eval_values
+            )
+            arg_strings = [
+                _format_args_string(grading_context_values, indx) for indx in range(len(inputs))
+            ]
+        except Exception as e:
+            raise MlflowException(
+                f"Values for grading_context_columns are malformed and cannot be "
+                f"formatted into a prompt for metric '{name}'.\n"
+                f"Required columns: {grading_context_columns}\n"
+                f"Values: {eval_values}\n"
+                f"Error: {e!r}\n"
+                f"Please check the following: \n"
+                "- predictions and targets (if required) are provided correctly\n"
+                "- grading_context_columns are mapped correctly using the evaluator_config "
+                "parameter\n"
+                "- input and output data are formatted correctly."
+            )
+
+        # Rows that produce the same prompt are only sent to the judge once
+        prompt_indices: Dict[str, List[int]] = defaultdict(list)
+        for indx, (input, output, arg_string) in enumerate(zip(inputs, outputs, arg_strings)):
+            prompt = format_eval_prompt(
+                input=input, output=output, grading_context_columns=arg_string
+            )
+            prompt_indices[prompt].append(indx)
+
+        # One (score, justification) row per input; object arrays are initialized to None
+        results = np.empty((len(inputs), 2), dtype=object)
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Never spin up more threads than there are judge requests to make
+        num_workers = max(min(max_workers, len(prompt_indices)), 1)
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
             futures = {
                 executor.submit(
                     score_model_on_one_payload,
-                    indx,
-                    input,
-                    output,
-                    grading_context_columns,
-                    eval_values,
-                    evaluation_context,
+                    prompt,
                     eval_parameters,
                     eval_model,
-                ): indx
-                for indx, (input, output) in enumerate(zip(inputs, outputs))
+                ): prompt
+                for prompt in prompt_indices
             }
 
-            for future in as_completed(futures, timeout=judge_request_timeout):
-                indx = futures[future]
-                score, justification = future.result()
-                scores[indx] = score
-                justifications[indx] = justification
-
-        # loop over the aggregations and compute the aggregate results on the scores
-        def aggregate_function(aggregate_option, scores):
-            import numpy as np
-
-            options = {
-                "min": np.min,
-                "max": np.max,
-                "mean": np.mean,
-                "median": np.median,
-                "variance": np.var,
-                "p90": lambda x: np.percentile(x, 90) if x else None,
-            }
+            # judge_request_timeout is enforced per request by the judge client. Passing it to
+            # as_completed would instead bound the time to score the whole dataset.
+            for future in as_completed(futures):
+                results[prompt_indices[futures[future]]] = future.result()
 
-            if aggregate_option not in options:
-                raise MlflowException(
-                    message=f"Invalid aggregate option {aggregate_option}.",
-                    error_code=INVALID_PARAMETER_VALUE,
-                )
+        scores = results[:, 0].tolist()
+        justifications = results[:, 1].tolist()
 
-            return options[aggregate_option](scores)
-
-        scores_for_aggregation = [score for score in scores if score is not None]
-
-        aggregate_results = (
-            {option: aggregate_function(option, scores_for_aggregation) for option in aggregations}
-            if aggregations is not None
-            else {}
+        scores_for_aggregation = np.fromiter(
+            (score for score in scores if score is not None), dtype=np.float64
         )
 
+        aggregate_results = _compute_aggregate_results(scores_for_aggregation, aggregations)
+
         return MetricValue(scores, justifications, aggregate_results)
 
     signature_parameters = [
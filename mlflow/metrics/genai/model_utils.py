@@ -1,8 +1,10 @@
 import json
 import os
 import urllib.parse
+from functools import lru_cache
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from mlflow.exceptions import MlflowException
 from mlflow.protos.databricks_pb2 import BAD_REQUEST, INVALID_PARAMETER_VALUE, UNAUTHENTICATED
@@ -10,6 +12,11 @@ from mlflow.utils.uri import append_to_uri_path
 
 ROUTE_TYPE = "llm/v1/completions"
 
+# Maximum number of keep-alive connections per host kept by the judge session. Judge requests
+# are issued concurrently from make_genai_metric's worker threads, and any connection beyond
+# this size is discarded (with a urllib3 warning) instead of being reused.
+_JUDGE_SESSION_POOL_SIZE = 32
+
 
 # TODO: improve this name
 def score_model_on_payload(model_uri, payload, timeout):
@@ -31,6 +38,21 @@ def score_model_on_payload(model_uri, payload, timeout):
         )
 
 
+@lru_cache(maxsize=8)
+def _get_judge_session(
+    # To create a new Session object for each process, we use the process id as the cache key,
+    # as in mlflow.utils.request_utils._cached_get_request_session.
+    _pid,
+):
+    adapter = HTTPAdapter(
+        pool_connections=_JUDGE_SESSION_POOL_SIZE, pool_maxsize=_JUDGE_SESSION_POOL_SIZE
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def _parse_model_uri(model_uri):
     parsed = urllib.parse.urlparse(model_uri, allow_fragments=False)
     scheme = parsed.scheme
@@ -77,13 +99,22 @@ def _call_openai_api(openai_uri, payload, timeout):
 
     payload = openai_provider._prepare_completion_request_payload(payload)
 
-    # use python requests instead of aiohttp
-    resp = requests.post(
+    # use python requests instead of aiohttp. The session is shared across judge requests (and
+    # the threads issuing them) so that connections to the OpenAI API are kept alive and reused.
+    # Failed requests are retried by the caller, so the session itself does not retry.
+    response = _get_judge_session(os.getpid()).post(
         url=append_to_uri_path(openai_provider._request_base_url, "chat/completions"),
         headers=openai_provider._request_headers,
         json=openai_provider._add_model_to_payload_if_necessary(payload),
         timeout=timeout,
-    ).json()
+    )
+    try:
+        resp = response.json()
+    except ValueError:
+        # Gateways in front of the API may answer with a non-JSON body (e.g. an HTML 503 page);
+        # surface those as HTTPError so the caller can tell transient failures apart.
+        response.raise_for_status()
+        raise
 
     if "error" in resp:
         error_type = resp["error"]["type"]
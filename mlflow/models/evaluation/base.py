@@ -110,10 +110,19 @@ class EvaluationMetric:
         ``"root_mean_squared_error"`` for ``"mse"``.
     :param version: (Optional) The metric version. For example ``v1``.
     :param metric_details: (Optional) A description of the metric and how it is calculated.
+    :param batch_size: (Optional) The number of rows the default evaluator predicts at once when
+        computing this metric. Currently only used by the latency metric.
     '''
 
     def __init__(
-        self, eval_fn, name, greater_is_better, long_name=None, version=None, metric_details=None
+        self,
+        eval_fn,
+        name,
+        greater_is_better,
+        long_name=None,
+        version=None,
+        metric_details=None,
+        batch_size=None,
     ):
         self.eval_fn = eval_fn
         self.name = name
@@ -121,6 +130,7 @@ class EvaluationMetric:
         self.long_name = long_name or name
         self.version = version
         self.metric_details = metric_details
+        self.batch_size = batch_size
 
     def __str__(self):
         parts = [f"name={self.name}, greater_is_better={self.greater_is_better}"]
@@ -131,6 +141,8 @@ class EvaluationMetric:
             parts.append(f"version={self.version}")
         if self.metric_details:
             parts.append(f"metric_details={self.metric_details}")
+        if self.batch_size:
+            parts.append(f"batch_size={self.batch_size}")
 
         return "EvaluationMetric(" + ", ".join(parts) + ")"
 
@@ -143,6 +155,7 @@ def make_metric(
     long_name=None,
     version=None,
     metric_details=None,
+    batch_size=None,
 ):
     '''
     A factory function to create an :py:class:`EvaluationMetric` object.
@@ -184,6 +197,8 @@ def make_metric(
         for ``"mse"``.
     :param version: (Optional) The metric version. For example ``v1``.
     :param metric_details: (Optional) A description of the metric and how it is calculated.
+    :param batch_size: (Optional) The number of rows the default evaluator predicts at once when
+        computing this metric. Currently only used by the latency metric.
 
     .. seealso::
 
@@ -203,7 +218,9 @@ def make_metric(
             )
         name = eval_fn.__name__
 
-    return EvaluationMetric(eval_fn, name, greater_is_better, long_name, version, metric_details)
+    return EvaluationMetric(
+        eval_fn, name, greater_is_better, long_name, version, metric_details, batch_size
+    )
 
 
 @developer_stable
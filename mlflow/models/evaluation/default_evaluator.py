@@ -1284,7 +1284,7 @@ class DefaultEvaluator(ModelEvaluator):
             )
         return
 
-    def _generate_model_predictions(self, compute_latency=False):
+    def _generate_model_predictions(self, compute_latency=False, latency_batch_size=1):
         """
         Helper method for generating model predictions
         """
@@ -1298,13 +1298,24 @@ class DefaultEvaluator(ModelEvaluator):
 
             is_dataframe = isinstance(X_copy, pd.DataFrame)
 
-            for row in X_copy.iterrows() if is_dataframe else enumerate(X_copy):
-                i, row_data = row
-                single_input = row_data.to_frame().T if is_dataframe else row_data
-                start_time = time.time()
-                y_pred = self.model.predict(single_input)
-                end_time = time.time()
-                pred_latencies.append(end_time - start_time)
+            if latency_batch_size > 1:
+                rows = X_copy.iloc if is_dataframe else X_copy
+                batches = (
+                    (rows[i : i + latency_batch_size], min(latency_batch_size, len(X_copy) - i))
+                    for i in range(0, len(X_copy), latency_batch_size)
+                )
+            else:
+                batches = (
+                    (row_data.to_frame().T if is_dataframe else row_data, 1)
+                    for _, row_data in (X_copy.iterrows() if is_dataframe else enumerate(X_copy))
+                )
+
+            for batch, num_rows in batches:
+                start_time = time.perf_counter()
+                y_pred = self.model.predict(batch)
+                end_time = time.perf_counter()
+                # Rows predicted together are each attributed an equal share of the batch time
+                pred_latencies.extend([(end_time - start_time) / num_rows] * num_rows)
                 y_pred_list.append(y_pred)
 
             # Update latency metric
@@ -1638,15 +1649,19 @@ class DefaultEvaluator(ModelEvaluator):
 
             with mlflow.utils.autologging_utils.disable_autologging():
                 compute_latency = False
+                latency_batch_size = 1
                 for extra_metric in self.extra_metrics:
                     # If latency metric is specified, we will compute latency for the model
                     # during prediction, and we will remove the metric from the list of extra
                     # metrics to be computed after prediction.
                     if extra_metric.name == _LATENCY_METRIC_NAME:
                         compute_latency = True
+                        latency_batch_size = extra_metric.batch_size or 1
                         self.extra_metrics.remove(extra_metric)
                         break
-                self._generate_model_predictions(compute_latency=compute_latency)
+                self._generate_model_predictions(
+                    compute_latency=compute_latency, latency_batch_size=latency_batch_size
+                )
                 if self.model_type in (_ModelType.CLASSIFIER, _ModelType.REGRESSOR):
                     self._compute_builtin_metrics()
                 elif self.model_type == _ModelType.QUESTION_ANSWERING:
@@ -3048,6 +3048,28 @@ def test_evaluate_with_latency():
     assert all(isinstance(grade, float) for grade in logged_data["latency"])
 
 
+def test_evaluate_with_latency_batch_size():
+    with mlflow.start_run():
+        model_info = mlflow.pyfunc.log_model(
+            artifact_path="model", python_model=language_model, input_example=["a", "b"]
+        )
+        data = pd.DataFrame({"text": ["sentence not", "Hello world.", "foo"]})
+        results = mlflow.evaluate(
+            model_info.model_uri,
+            data,
+            model_type="text",
+            evaluators="default",
+            extra_metrics=[mlflow.metrics.latency(batch_size=2)],
+        )
+
+    logged_data = pd.DataFrame(**results.artifacts["eval_results_table"].content)
+    assert logged_data["outputs"].tolist() == data["text"].tolist()
+    latencies = logged_data["latency"].tolist()
+    assert len(latencies) == 3
+    assert all(isinstance(grade, float) for grade in latencies)
+    assert latencies[0] == latencies[1]
+
+
 def test_evaluate_with_latency_static_dataset():
     with mlflow.start_run() as run:
         mlflow.pyfunc.log_model(
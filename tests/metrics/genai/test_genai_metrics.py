@@ -1,17 +1,22 @@
 import inspect
 import re
+import time
 from unittest import mock
 
 import numpy as np
 import pandas as pd
 import pytest
+import requests
 
 from mlflow.exceptions import MlflowException
 from mlflow.metrics.base import EvaluationExample
 from mlflow.metrics.genai import model_utils
 from mlflow.metrics.genai.genai_metric import (
+    _compile_prompt_template,
+    _compute_aggregate_results,
     _extract_score_and_justification,
     _format_args_string,
+    _get_grading_context_values,
     make_genai_metric,
 )
 from mlflow.metrics.genai.metric_definitions import (
@@ -20,12 +25,14 @@ from mlflow.metrics.genai.metric_definitions import (
     answer_similarity,
     faithfulness,
 )
+from mlflow.metrics.genai.prompt_template import PromptTemplate
 from mlflow.metrics.genai.prompts.v1 import (
     AnswerCorrectnessMetric,
     AnswerRelevanceMetric,
     AnswerSimilarityMetric,
     FaithfulnessMetric,
 )
+from mlflow.protos.databricks_pb2 import BAD_REQUEST
 
 openai_justification1 = (
     "The provided output mostly answers the question, but it is missing or hallucinating on "
@@ -310,13 +317,15 @@ def test_make_genai_metric_incorrect_response():
         model_utils,
         "score_model_on_payload",
         side_effect=Exception("Some error occurred"),
-    ):
+    ) as mock_predict_function, mock.patch("time.sleep") as mock_sleep:
         metric_value = custom_metric.eval_fn(
             pd.Series([mlflow_prediction]),
             {},
             pd.Series(["What is MLflow?"]),
             pd.Series([mlflow_ground_truth]),
         )
+        assert mock_predict_function.call_count == 1
+        mock_sleep.assert_not_called()
 
     assert metric_value.scores == [None]
     assert metric_value.justifications == [
@@ -328,6 +337,295 @@ def test_make_genai_metric_incorrect_response():
     assert metric_value.aggregate_results["p90"] is None
 
 
+def test_make_genai_metric_caches_judge_responses():
+    def make_metric(**kwargs):
+        return make_genai_metric(
+            name="correctness",
+            version="v1",
+            definition=example_definition,
+            grading_prompt=example_grading_prompt,
+            examples=[mlflow_example],
+            model="gateway:/gpt-3.5-turbo",
+            grading_context_columns=["targets"],
+            parameters={"temperature": 0.0},
+            greater_is_better=True,
+            aggregations=["mean"],
+            **kwargs,
+        )
+
+    def evaluate(metric):
+        return metric.eval_fn(
+            pd.Series([mlflow_prediction]),
+            {},
+            pd.Series(["What is MLflow?"]),
+            pd.Series([mlflow_ground_truth]),
+        )
+
+    custom_metric = make_metric()
+    with mock.patch.object(
+        model_utils,
+        "score_model_on_payload",
+        return_value=properly_formatted_openai_response1,
+    ) as mock_predict_function:
+        first_value = evaluate(custom_metric)
+        second_value = evaluate(custom_metric)
+        assert mock_predict_function.call_count == 1
+
+    assert first_value.scores == second_value.scores == [3]
+    assert first_value.justifications == second_value.justifications == [openai_justification1]
+
+    uncached_metric = make_metric(cache=False)
+    with mock.patch.object(
+        model_utils,
+        "score_model_on_payload",
+        return_value=properly_formatted_openai_response1,
+    ) as mock_predict_function:
+        evaluate(uncached_metric)
+        evaluate(uncached_metric)
+        assert mock_predict_function.call_count == 2
+
+
+def test_make_genai_metric_scores_duplicate_rows_once():
+    custom_metric = make_genai_metric(
+        name="correctness",
+        version="v1",
+        definition=example_definition,
+        grading_prompt=example_grading_prompt,
+        examples=[mlflow_example],
+        model="gateway:/gpt-3.5-turbo",
+        grading_context_columns=["targets"],
+        parameters={"temperature": 0.0},
+        greater_is_better=True,
+        aggregations=["mean"],
+        cache=False,
+    )
+
+    with mock.patch.object(
+        model_utils,
+        "score_model_on_payload",
+        return_value=properly_formatted_openai_response1,
+    ) as mock_predict_function:
+        metric_value = custom_metric.eval_fn(
+            pd.Series([mlflow_prediction] * 3),
+            {},
+            pd.Series(["What is MLflow?"] * 3),
+            pd.Series([mlflow_ground_truth] * 3),
+        )
+        assert mock_predict_function.call_count == 1
+
+    assert metric_value.scores == [3, 3, 3]
+    assert metric_value.justifications == [openai_justification1] * 3
+    assert metric_value.aggregate_results == {"mean": 3}
+
+
+def test_make_genai_metric_defaults():
+    custom_metric = make_genai_metric(
+        name="fake_metric",
+        definition="Fake metric definition",
+        grading_prompt="Fake metric grading prompt",
+    )
+
+    assert custom_metric.version == "v1"
+    assert [
+        param.name for param in inspect.signature(custom_metric.eval_fn).parameters.values()
+    ] == ["predictions", "metrics", "inputs"]
+
+    with mock.patch.object(
+        model_utils,
+        "score_model_on_payload",
+        return_value=properly_formatted_openai_response1,
+    ) as mock_predict_function:
+        metric_value = custom_metric.eval_fn(pd.Series(["prediction"]), {}, pd.Series(["input"]))
+        assert mock_predict_function.call_args[0][0] == "openai:/gpt-4"
+
+    assert metric_value.scores == [3]
+    assert metric_value.aggregate_results == {"mean": 3, "variance": 0, "p90": 3}
+
+
+def test_make_genai_metric_judge_request_timeout_applies_per_request():
+    custom_metric = make_genai_metric(
+        name="correctness",
+        definition=example_definition,
+        grading_prompt=example_grading_prompt,
+        model="gateway:/gpt-3.5-turbo",
+        aggregations=["mean"],
+        max_workers=1,
+        judge_request_timeout=0.2,
+    )
+
+    def slow_score_model_on_payload(*args, **kwargs):
+        time.sleep(0.1)
+        return properly_formatted_openai_response1
+
+    with mock.patch.object(
+        model_utils, "score_model_on_payload", side_effect=slow_score_model_on_payload
+    ):
+        metric_value = custom_metric.eval_fn(
+            pd.Series(["prediction1", "prediction2", "prediction3"]),
+            {},
+            pd.Series(["input1", "input2", "input3"]),
+        )
+
+    assert metric_value.scores == [3, 3, 3]
+
+
+def test_make_genai_metric_retries_failed_judge_requests():
+    custom_metric = make_genai_metric(
+        name="correctness",
+        definition=example_definition,
+        grading_prompt=example_grading_prompt,
+        model="gateway:/gpt-3.5-turbo",
+        aggregations=["mean"],
+        max_retries=2,
+        cache=False,
+    )
+
+    with mock.patch.object(
+        model_utils,
+        "score_model_on_payload",
+        side_effect=[MlflowException("Rate limit reached"), properly_formatted_openai_response1],
+    ) as mock_predict_function, mock.patch("time.sleep") as mock_sleep:
+        metric_value = custom_metric.eval_fn(pd.Series(["prediction"]), {}, pd.Series(["input"]))
+        assert mock_predict_function.call_count == 2
+        mock_sleep.assert_called_once_with(0.5)
+
+    assert metric_value.scores == [3]
+    assert metric_value.justifications == [openai_justification1]
+
+    with mock.patch.object(
+        model_utils,
+        "score_model_on_payload",
+        side_effect=MlflowException("Invalid request", error_code=BAD_REQUEST),
+    ) as mock_predict_function, mock.patch("time.sleep") as mock_sleep:
+        with pytest.raises(MlflowException, match="Invalid request"):
+            custom_metric.eval_fn(pd.Series(["prediction"]), {}, pd.Series(["input"]))
+        assert mock_predict_function.call_count == 1
+        mock_sleep.assert_not_called()
+
+
+def test_make_genai_metric_retries_transient_errors_until_max_retries():
+    custom_metric = make_genai_metric(
+        name="correctness",
+        definition=example_definition,
+        grading_prompt=example_grading_prompt,
+        model="gateway:/gpt-3.5-turbo",
+        aggregations=["mean"],
+    )
+
+    with mock.patch.object(
+        model_utils,
+        "score_model_on_payload",
+        side_effect=requests.exceptions.ConnectionError("Connection reset"),
+    ) as mock_predict_function, mock.patch("time.sleep") as mock_sleep:
+        metric_value = custom_metric.eval_fn(pd.Series(["prediction"]), {}, pd.Series(["input"]))
+        assert mock_predict_function.call_count == 4
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.5, 1, 2]
+
+    assert metric_value.scores == [None]
+    assert metric_value.justifications == [
+        "Failed to score model on payload. Error: Connection reset"
+    ]
+
+
+def test_make_genai_metric_retries_non_json_server_errors(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    custom_metric = make_genai_metric(
+        name="correctness",
+        definition=example_definition,
+        grading_prompt=example_grading_prompt,
+        model="openai:/gpt-3.5-turbo",
+        aggregations=["mean"],
+    )
+
+    unavailable = requests.Response()
+    unavailable.status_code = 503
+    unavailable.reason = "Service Unavailable"
+    unavailable._content = b"<html><body>Service Unavailable</body></html>"
+
+    with mock.patch("requests.Session.post", return_value=unavailable) as mock_post, mock.patch(
+        "time.sleep"
+    ) as mock_sleep:
+        metric_value = custom_metric.eval_fn(pd.Series(["prediction"]), {}, pd.Series(["input"]))
+        assert mock_post.call_count == 4
+        assert mock_sleep.call_count == 3
+
+    assert metric_value.scores == [None]
+    assert "503 Server Error: Service Unavailable" in metric_value.justifications[0]
+
+
+def test_make_genai_metric_does_not_retry_configuration_errors(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    custom_metric = make_genai_metric(
+        name="correctness",
+        definition=example_definition,
+        grading_prompt=example_grading_prompt,
+        model="openai:/gpt-3.5-turbo",
+        aggregations=["mean"],
+    )
+
+    with mock.patch("time.sleep") as mock_sleep:
+        metric_value = custom_metric.eval_fn(
+            pd.Series(["prediction1", "prediction2"]), {}, pd.Series(["input1", "input2"])
+        )
+        mock_sleep.assert_not_called()
+
+    assert metric_value.scores == [None, None]
+    assert (
+        metric_value.justifications
+        == ["Failed to score model on payload. Error: OPENAI_API_KEY environment variable not set"]
+        * 2
+    )
+
+    custom_metric = make_genai_metric(
+        name="correctness",
+        definition=example_definition,
+        grading_prompt=example_grading_prompt,
+        model="model:/123",
+        aggregations=["mean"],
+    )
+
+    with mock.patch("time.sleep") as mock_sleep:
+        metric_value = custom_metric.eval_fn(pd.Series(["prediction"]), {}, pd.Series(["input"]))
+        mock_sleep.assert_not_called()
+
+    assert metric_value.scores == [None]
+
+
+def test_make_genai_metric_does_not_retry_unparseable_responses():
+    custom_metric = make_genai_metric(
+        name="correctness",
+        definition=example_definition,
+        grading_prompt=example_grading_prompt,
+        model="gateway:/gpt-3.5-turbo",
+        aggregations=["mean"],
+    )
+
+    response_without_text = {"candidates": [{"metadata": {"finish_reason": "stop"}}]}
+    with mock.patch.object(
+        model_utils,
+        "score_model_on_payload",
+        return_value=response_without_text,
+    ) as mock_predict_function, mock.patch("time.sleep") as mock_sleep:
+        metric_value = custom_metric.eval_fn(pd.Series(["prediction"]), {}, pd.Series(["input"]))
+        assert mock_predict_function.call_count == 1
+        mock_sleep.assert_not_called()
+
+    assert metric_value.scores == [None]
+    assert metric_value.justifications == [
+        f"Failed to extract score and justification. Raw output: {response_without_text}"
+    ]
+
+
+def test_make_genai_metric_rejects_negative_max_retries():
+    with pytest.raises(MlflowException, match="max_retries must be a non-negative integer"):
+        make_genai_metric(
+            name="correctness",
+            definition=example_definition,
+            grading_prompt=example_grading_prompt,
+            max_retries=-1,
+        )
+
+
 def test_malformed_input_raises_exception():
     error_message = "Values for grading_context_columns are malformed and cannot be "
     "formatted into a prompt for metric 'answer_similarity'.\nProvided values: {'targets': None}\n"
@@ -469,7 +767,10 @@ def test_make_genai_metric_failure():
 
 
 def test_format_args_string():
-    variable_string = _format_args_string(["foo", "bar"], {"foo": ["foo"], "bar": ["bar"]}, 0)
+    grading_context_values = _get_grading_context_values(
+        ["foo", "bar"], {"foo": ["foo"], "bar": ["bar"]}
+    )
+    variable_string = _format_args_string(grading_context_values, 0)
 
     assert variable_string == (
         "Additional information used by the model:\nkey: foo\nvalue:\nfoo" "\nkey: bar\nvalue:\nbar"
@@ -479,7 +780,25 @@ def test_format_args_string():
         MlflowException,
         match=re.escape("bar does not exist in the eval function ['foo']."),
     ):
-        variable_string = _format_args_string(["foo", "bar"], pd.DataFrame({"foo": ["foo"]}), 0)
+        _get_grading_context_values(["foo", "bar"], pd.DataFrame({"foo": ["foo"]}))
+
+    assert _format_args_string([], 0) == ""
+
+
+def test_compile_prompt_template():
+    prompt_template = PromptTemplate("Input: {input}\nOutput: {output}\n{{literal}} {input}")
+    format_prompt = _compile_prompt_template(prompt_template)
+
+    assert format_prompt(input="foo", output=3, unused="bar") == prompt_template.format(
+        input="foo", output=3, unused="bar"
+    )
+    with pytest.raises(KeyError, match="output"):
+        format_prompt(input="foo")
+
+    prompt_template = PromptTemplate("Score: {score:.2f} {name!r}")
+    format_prompt = _compile_prompt_template(prompt_template)
+
+    assert format_prompt(score=1, name="foo") == "Score: 1.00 'foo'"
 
 
 def test_extract_score_and_justification():
@@ -532,6 +851,26 @@ def test_extract_score_and_justification():
     assert score4 == 4
     assert justification4 == "This is a justification"
 
+    score, justification = _extract_score_and_justification(
+        output={
+            "candidates": [
+                {
+                    "text": '\n  {"score": 5, "justification": "This is a justification"}',
+                }
+            ]
+        }
+    )
+
+    assert score == 5
+    assert justification == "This is a justification"
+
+    score, justification = _extract_score_and_justification(
+        output={"candidates": [{"text": "{score: 1, justification: This is a justification"}]}
+    )
+
+    assert score == 1
+    assert justification == "This is a justification"
+
     malformed_output = {
         "candidates": [
             {
@@ -548,6 +887,45 @@ def test_extract_score_and_justification():
         == f"Failed to extract score and justification. Raw output: {malformed_output}"
     )
 
+    for malformed_output in [
+        {"candidates": [{"text": '{"justification": "This is a justification"}'}]},
+        {"candidates": [{"text": '{"score": "four", "justification": "justification"}'}]},
+        {"candidates": [{"text": "[4]"}]},
+        {"candidates": []},
+        {"candidates": [{"metadata": {"finish_reason": "stop"}}]},
+        {"candidates": [{"text": {"score": 4}}]},
+        {"candidates": ["score: 4, justification: This is a justification"]},
+        {"error": "Some error occurred"},
+        None,
+    ]:
+        score, justification = _extract_score_and_justification(output=malformed_output)
+
+        assert score is None
+        assert (
+            justification
+            == f"Failed to extract score and justification. Raw output: {malformed_output}"
+        )
+
+
+def test_compute_aggregate_results():
+    scores = np.array([1, 5, 3, 4, 4, 2, 5], dtype=np.float64)
+
+    aggregate_results = _compute_aggregate_results(
+        scores, ["min", "max", "mean", "median", "variance", "p90"]
+    )
+
+    assert aggregate_results == pytest.approx(
+        {
+            "min": 1,
+            "max": 5,
+            "mean": np.mean(scores),
+            "median": 4,
+            "variance": np.var(scores),
+            "p90": np.percentile(scores, 90),
+        }
+    )
+    assert _compute_aggregate_results(np.array([], dtype=np.float64), ["p90"]) == {"p90": None}
+
 
 def test_correctness_metric():
     correctness_metric = answer_similarity(
@@ -821,3 +1199,17 @@ def test_make_genai_metric_metric_details():
         == f"EvaluationMetric(name=correctness, greater_is_better=True, long_name=correctness, version=v1, metric_details={expected_metric_details})"
     )
     # pylint: enable=line-too-long
+
+
+def test_genai_metrics_are_lazily_exported_from_mlflow_metrics():
+    import mlflow.metrics
+
+    assert mlflow.metrics.make_genai_metric is make_genai_metric
+    assert mlflow.metrics.answer_similarity is answer_similarity
+    assert mlflow.metrics.answer_correctness is answer_correctness
+    assert mlflow.metrics.answer_relevance is answer_relevance
+    assert mlflow.metrics.faithfulness is faithfulness
+    assert "make_genai_metric" in dir(mlflow.metrics)
+
+    with pytest.raises(AttributeError, match="has no attribute 'not_a_metric'"):
+        mlflow.metrics.not_a_metric
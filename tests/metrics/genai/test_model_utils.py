@@ -1,3 +1,4 @@
+import os
 from unittest import mock
 
 import pytest
@@ -5,6 +6,7 @@ from requests import Response
 
 from mlflow.exceptions import MlflowException
 from mlflow.metrics.genai.model_utils import (
+    _get_judge_session,
     _parse_model_uri,
     score_model_on_payload,
 )
@@ -98,7 +100,7 @@ def test_score_model_openai(set_envs):
         "headers": {"Content-Type": "application/json"},
     }
 
-    with mock.patch("requests.post", return_value=MockResponse(resp, 200)) as mock_post:
+    with mock.patch("requests.Session.post", return_value=MockResponse(resp, 200)) as mock_post:
         score_model_on_payload(
             "openai:/gpt-3.5-turbo", {"prompt": "my prompt", "temperature": 0.1}, 10
         )
@@ -148,7 +150,7 @@ def test_score_model_azure_openai(set_azure_envs):
         "headers": {"Content-Type": "application/json"},
     }
 
-    with mock.patch("requests.post", return_value=MockResponse(resp, 200)) as mock_post:
+    with mock.patch("requests.Session.post", return_value=MockResponse(resp, 200)) as mock_post:
         score_model_on_payload(
             "openai:/gpt-3.5-turbo", {"prompt": "my prompt", "temperature": 0.1}, 10
         )
@@ -188,3 +190,11 @@ def test_score_model_gateway():
     with mock.patch("mlflow.gateway.query", return_value=expected_output):
         response = score_model_on_payload("gateway:/my-route", {}, 10)
         assert response == expected_output
+
+
+def test_judge_session_pool_fits_concurrent_workers():
+    session = _get_judge_session(os.getpid())
+
+    assert _get_judge_session(os.getpid()) is session
+    for prefix in ("https://", "http://"):
+        assert session.get_adapter(prefix)._pool_maxsize >= 32
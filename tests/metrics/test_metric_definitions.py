@@ -3,12 +3,14 @@ from unittest import mock
 import pandas as pd
 import pytest
 
+from mlflow.exceptions import MlflowException
 from mlflow.metrics import (
     MetricValue,
     ari_grade_level,
     exact_match,
     f1_score,
     flesch_kincaid_grade_level,
+    latency,
     mae,
     mape,
     max_error,
@@ -238,3 +240,14 @@ def test_binary_f1_score():
     targets = pd.Series([1, 1, 1, 1, 0, 0, 0, 0])
     result = f1_score().eval_fn(predictions, targets, {})
     assert abs(result.aggregate_results["f1_score"] - 0.5713) < 1e-3
+
+
+def test_latency_batch_size():
+    assert latency().batch_size == 1
+
+    metric = latency(batch_size=4)
+    assert metric.batch_size == 4
+    assert "batch_size=4" in str(metric)
+
+    with pytest.raises(MlflowException, match="batch_size must be a positive integer"):
+        latency(batch_size=0)